@@ -1,18 +1,111 @@
 """Command-line interface for ccs (Cursor Conversation Search)."""
 
+import functools
 import json
 import sqlite3
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, Optional
 
 import click
-from rich.console import Console
-from rich.panel import Panel
 
-from .database import CursorDatabase, get_cursor_db_path
-from .formatters import RichFormatter, MarkdownFormatter
-from .stats import ConversationStats
+from .database import CursorDatabase, connect_read_only, get_cursor_db_path
+from .datetime_utils import parse_datetime
+from .utils import truncate_text
 
+# rich, the formatters (which pull in rich.markdown and pygments) and the stats
+# module (which pulls in statistics) are imported lazily so that `ccs --help` and
+# short commands don't pay for them at startup.
+if TYPE_CHECKING:
+    from rich.console import Console
 
-console = Console()
+    from .formatters import Formatter
+    from .stats import ConversationStats
+
+
+@functools.cache
+def _get_console() -> 'Console':
+    """Get the shared rich Console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+class _LazyConsole:
+    """Module-level stand-in for the rich Console that defers creating it until first use."""
+
+    def __getattr__(self, name):
+        return getattr(_get_console(), name)
+
+
+console = _LazyConsole()
+
+
+@functools.cache
+def _get_db() -> CursorDatabase:
+    """Get the shared CursorDatabase instance for this process."""
+    return CursorDatabase()
+
+
+@functools.cache
+def _get_formatter(output_format: str) -> 'Formatter':
+    """Get the shared formatter instance for an output format ('rich' or 'markdown')."""
+    from .formatters import MarkdownFormatter, RichFormatter
+
+    return RichFormatter() if output_format == 'rich' else MarkdownFormatter()
+
+
+def _parse_time_option(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[datetime]:
+    """Click callback that parses a --since/--before value once, up front."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if not parsed:
+        raise click.BadParameter(f"Could not parse time: {value}")
+    return parsed
+
+
+def _write_lines(lines: Iterable[str]) -> None:
+    """Write plain-text lines to stdout (for piping), flushing once at the end.
+
+    Unlike print() per line, this hands the lines to stdout's buffer in one
+    writelines() call and never flushes mid-stream on a pipe.
+    """
+    sys.stdout.writelines(f"{line}\n" for line in lines)
+    sys.stdout.flush()
+
+
+def time_range_options(verb: str):
+    """Decorator adding the shared --since/--before options to a command.
+
+    Args:
+        verb: Leading words of the help text (e.g. "Show", "Filter to")
+    """
+    def decorator(f):
+        f = click.option('--before', callback=_parse_time_option,
+                         help=f'{verb} conversations before this time (same format as --since)')(f)
+        f = click.option('--since', callback=_parse_time_option,
+                         help=f'{verb} conversations since this time. '
+                              'Relative: "3d", "15m", "4h", "1w". Absolute: "2024-01-01"')(f)
+        return f
+    return decorator
+
+
+def pagination_options(f):
+    """Decorator adding the shared --per-page/--page options to a command."""
+    f = click.option('--page', '-p', type=int, default=1, help='Page number (starts at 1)')(f)
+    f = click.option('--per-page', '-n', type=int, default=20, help='Results per page')(f)
+    return f
+
+
+include_empty_option = click.option(
+    '--include-empty', is_flag=True, help='Include empty conversations (0 messages)'
+)
+format_option = click.option(
+    '--format', 'output_format', type=click.Choice(['rich', 'markdown']), default='rich'
+)
 
 
 def render_bar(value: int, max_value: int, width: int = 30) -> str:
@@ -95,46 +188,42 @@ def main():
 
 @main.command()
 @click.option('--all', 'show_all', is_flag=True, help='Show all conversations including archived')
-@click.option('--include-empty', is_flag=True, help='Include empty conversations (0 messages)')
-@click.option('--per-page', '-n', type=int, default=20, help='Results per page')
-@click.option('--page', '-p', type=int, default=1, help='Page number (starts at 1)')
-@click.option('--since', help='Show conversations since this time. Relative: "3d", "15m", "4h", "1w". Absolute: "2024-01-01"')
-@click.option('--before', help='Show conversations before this time (same format as --since)')
-@click.option('--format', 'output_format', type=click.Choice(['rich', 'markdown']), default='rich')
-def list(show_all: bool, include_empty: bool, per_page: int, page: int, since: str, before: str, output_format: str):
+@include_empty_option
+@pagination_options
+@time_range_options('Show')
+@format_option
+def list(show_all: bool, include_empty: bool, per_page: int, page: int, since: Optional[datetime], before: Optional[datetime], output_format: str):
     """List all conversations."""
     try:
-        db = CursorDatabase()
-        conversations = db.list_conversations(since=since, before=before, include_empty=include_empty)
-
-        if not show_all:
-            conversations = [c for c in conversations if not c['is_archived']]
-
-        total = len(conversations)
+        db = _get_db()
+        archived = None if show_all else False
         start = (page - 1) * per_page
         end = start + per_page
-        conversations = conversations[start:end]
+        conversations = db.list_conversations(
+            since=since, before=before, include_empty=include_empty,
+            archived=archived, limit=per_page, offset=start
+        )
 
         if not conversations:
             console.print("[yellow]No conversations found.[/yellow]")
             return
 
         # Pagination info
+        total = db.count_conversations(since=since, before=before, include_empty=include_empty, archived=archived)
         showing_start = start + 1
         showing_end = min(end, total)
         total_pages = (total + per_page - 1) // per_page
 
         # Use formatter based on output format
         if output_format == 'rich':
-            formatter = RichFormatter()
+            formatter = _get_formatter(output_format)
             table = formatter.format_conversation_list(conversations)
             console.print(table)
             console.print(f"[dim]Showing {showing_start}-{showing_end} of {total} conversations (page {page}/{total_pages})[/dim]")
         else:  # markdown
-            formatter = MarkdownFormatter()
+            formatter = _get_formatter(output_format)
             output = formatter.format_conversation_list(conversations)
-            print(output)
-            print(f"\n_Showing {showing_start}-{showing_end} of {total} conversations (page {page}/{total_pages})_")
+            _write_lines([output, f"\n_Showing {showing_start}-{showing_end} of {total} conversations (page {page}/{total_pages})_"])
 
     except FileNotFoundError as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -142,7 +231,7 @@ def list(show_all: bool, include_empty: bool, per_page: int, page: int, since: s
         raise click.Abort()
 
 
-def find_conversation(db: CursorDatabase, query: str, since: str = None, before: str = None, include_empty: bool = False) -> tuple:
+def find_conversation(db: CursorDatabase, query: str, since: Optional[datetime] = None, before: Optional[datetime] = None, include_empty: bool = False) -> tuple:
     """Find a conversation by ID or title, optionally filtered by time.
 
     Args:
@@ -155,24 +244,20 @@ def find_conversation(db: CursorDatabase, query: str, since: str = None, before:
     Returns:
         tuple: (matching_conv, conversation_id) or (None, None) if not found
     """
-    all_convs = db.list_conversations(since=since, before=before, include_empty=include_empty)
-    query_lower = query.lower()
+    filters = {'since': since, 'before': before, 'include_empty': include_empty}
 
     # First try exact ID match
-    for conv in all_convs:
-        if conv['id'] == query:
-            return conv, conv['id']
+    matches = db.find_by_id(query, exact=True, limit=1, **filters)
+    if matches:
+        return matches[0], matches[0]['id']
 
     # Try partial ID match
-    for conv in all_convs:
-        if conv['id'].startswith(query) or query in conv['id']:
-            return conv, conv['id']
+    matches = db.find_by_id(query, limit=1, **filters)
+    if matches:
+        return matches[0], matches[0]['id']
 
-    # Try title/subtitle match
-    matches = []
-    for conv in all_convs:
-        if query_lower in conv['title'].lower() or query_lower in conv['subtitle'].lower():
-            matches.append(conv)
+    # Try title/subtitle match (only the first few are ever shown)
+    matches = db.find_by_title(query, limit=5, **filters)
 
     if len(matches) == 1:
         return matches[0], matches[0]['id']
@@ -188,19 +273,19 @@ def find_conversation(db: CursorDatabase, query: str, since: str = None, before:
 
 @main.command()
 @click.argument('query')
-@click.option('--format', 'output_format', type=click.Choice(['rich', 'markdown']), default='rich')
-@click.option('--include-empty', is_flag=True, help='Include empty conversations (0 messages)')
-@click.option('--since', help='Filter to conversations since this time. Relative: "3d", "15m", "4h", "1w". Absolute: "2024-01-01"')
-@click.option('--before', help='Filter to conversations before this time (same format as --since)')
+@format_option
+@include_empty_option
+@time_range_options('Filter to')
 @click.option('--show-code-details', is_flag=True, help='Show detailed code block information')
 @click.option('--show-code-diff', is_flag=True, help='Show code diffs for code blocks')
 @click.option('--show-empty', is_flag=True, help='Show empty assistant messages (streaming artifacts)')
 @click.option('--show-thinking', is_flag=True, help='Expand thinking/reasoning traces')
 @click.option('--show-tool-calls', is_flag=True, help='Expand tool call details')
-def show(query: str, output_format: str, include_empty: bool, since: str, before: str, show_code_details: bool, show_code_diff: bool, show_empty: bool, show_thinking: bool, show_tool_calls: bool):
+@click.option('--head', type=click.IntRange(min=0), help='Only show the first N messages')
+def show(query: str, output_format: str, include_empty: bool, since: Optional[datetime], before: Optional[datetime], show_code_details: bool, show_code_diff: bool, show_empty: bool, show_thinking: bool, show_tool_calls: bool, head: Optional[int]):
     """Show a specific conversation by ID or title, optionally filtered by time."""
     try:
-        db = CursorDatabase()
+        db = _get_db()
 
         matching_conv, conversation_id = find_conversation(db, query, since=since, before=before, include_empty=include_empty)
 
@@ -208,12 +293,11 @@ def show(query: str, output_format: str, include_empty: bool, since: str, before
             console.print(f"[red]Conversation matching '{query}' not found[/red]")
             raise click.Abort()
 
-        conversation = db.get_conversation(conversation_id)
-        messages = db.get_messages(conversation_id)
+        conversation, messages = db.get_conversation_with_messages(conversation_id)
 
         # Use formatter based on output format
         if output_format == 'rich':
-            formatter = RichFormatter()
+            formatter = _get_formatter(output_format)
             output = formatter.format_conversation(
                 conversation=conversation,
                 messages=messages,
@@ -222,17 +306,19 @@ def show(query: str, output_format: str, include_empty: bool, since: str, before
                 show_empty=show_empty,
                 show_thinking=show_thinking,
                 show_tool_calls=show_tool_calls,
+                head=head,
                 db=db
             )
             console.print(output)
         else:  # markdown
-            formatter = MarkdownFormatter()
-            output = formatter.format_conversation(
+            formatter = _get_formatter(output_format)
+            # Stream line by line so long conversations are never held as one string
+            _write_lines(formatter.iter_conversation_lines(
                 conversation=conversation,
                 messages=messages,
-                show_empty=show_empty
-            )
-            print(output)  # Plain print for piping
+                show_empty=show_empty,
+                head=head
+            ))
 
     except FileNotFoundError as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -245,14 +331,12 @@ def show(query: str, output_format: str, include_empty: bool, since: str, before
 @main.command()
 @click.argument('query')
 @click.option('--all', 'show_all', is_flag=True, help='Show all conversations including archived')
-@click.option('--include-empty', is_flag=True, help='Include empty conversations (0 messages)')
-@click.option('--per-page', '-n', type=int, default=20, help='Results per page')
-@click.option('--page', '-p', type=int, default=1, help='Page number (starts at 1)')
-@click.option('--since', help='Search conversations since this time. Relative: "3d", "15m", "4h", "1w". Absolute: "2024-01-01"')
-@click.option('--before', help='Search conversations before this time (same format as --since)')
-@click.option('--format', 'output_format', type=click.Choice(['rich', 'markdown']), default='rich')
+@include_empty_option
+@pagination_options
+@time_range_options('Search')
+@format_option
 @click.option('--search-diffs', is_flag=True, help='Also search in code diffs (file paths and diff content)')
-def search(query: str, show_all: bool, include_empty: bool, per_page: int, page: int, since: str, before: str, output_format: str, search_diffs: bool):
+def search(query: str, show_all: bool, include_empty: bool, per_page: int, page: int, since: Optional[datetime], before: Optional[datetime], output_format: str, search_diffs: bool):
     """Search conversations by text content.
 
     Multiple words are treated as separate keywords (AND logic) - all must match.
@@ -265,16 +349,15 @@ def search(query: str, show_all: bool, include_empty: bool, per_page: int, page:
       ccs search authentication          # Single keyword
     """
     try:
-        db = CursorDatabase()
-        results = db.search_conversations(query, since=since, before=before, include_empty=include_empty, search_diffs=search_diffs)
-
-        if not show_all:
-            results = [r for r in results if not r['is_archived']]
-
-        total = len(results)
+        db = _get_db()
+        archived = None if show_all else False
         start = (page - 1) * per_page
         end = start + per_page
-        results = results[start:end]
+
+        results, total = db.search_conversations_page(
+            query, since=since, before=before, include_empty=include_empty,
+            search_diffs=search_diffs, archived=archived, limit=per_page, offset=start
+        )
 
         if not results:
             console.print(f"[yellow]No conversations found matching '{query}'[/yellow]")
@@ -287,17 +370,16 @@ def search(query: str, show_all: bool, include_empty: bool, per_page: int, page:
 
         # Use formatter based on output format
         if output_format == 'rich':
-            formatter = RichFormatter()
+            formatter = _get_formatter(output_format)
             table = formatter.format_conversation_list(results)
             table.title = f"Search Results for '{query}'"
             console.print(table)
             console.print(f"[dim]Showing {showing_start}-{showing_end} of {total} results (page {page}/{total_pages})[/dim]")
         else:  # markdown
-            formatter = MarkdownFormatter()
+            formatter = _get_formatter(output_format)
             output = formatter.format_conversation_list(results)
             output = f"# Search Results for '{query}'\n\n" + output
-            print(output)
-            print(f"\n_Showing {showing_start}-{showing_end} of {total} results (page {page}/{total_pages})_")
+            _write_lines([output, f"\n_Showing {showing_start}-{showing_end} of {total} results (page {page}/{total_pages})_"])
 
     except FileNotFoundError as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -311,6 +393,8 @@ def check_db():
     Checks database structure, key patterns, and JSON field expectations
     against what ccs requires.
     """
+    from rich.panel import Panel
+
     db_path = get_cursor_db_path()
 
     console.print(Panel.fit(
@@ -325,21 +409,27 @@ def check_db():
     # 1. Check database exists
     console.print("[bold]1. Database Location[/bold]")
     console.print(f"   Path: {db_path}")
-    if not db_path.exists():
+    try:
+        db_size = db_path.stat().st_size
+    except FileNotFoundError:
         console.print("   [red]✗ Database not found[/red]")
         issues.append("Database file does not exist")
         _print_check_db_summary(issues, warnings)
         return
-    console.print(f"   [green]✓ Database exists[/green] ({db_path.stat().st_size / 1024:.2f} KB)")
+    console.print(f"   [green]✓ Database exists[/green] ({db_size / 1024:.2f} KB)")
     console.print()
 
     # 2. Check database connection and table structure
     console.print("[bold]2. Database Structure[/bold]")
     try:
-        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        conn = connect_read_only(db_path)
         cursor = conn.cursor()
         console.print("   [green]✓ Can open read-only connection[/green]")
 
+        # Informational: WAL lets ccs read while Cursor is writing
+        cursor.execute("PRAGMA journal_mode")
+        console.print(f"   [dim]Journal mode: {cursor.fetchone()[0]}[/dim]")
+
         # Check table exists
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cursorDiskKV'")
         if not cursor.fetchone():
@@ -370,9 +460,19 @@ def check_db():
             'codeBlockDiff:%': ('Code diffs', False),  # Optional - may not exist if no diffs
         }
 
+        # Count every pattern in one statement. Each is counted as a key range
+        # (not LIKE) so SQLite reads only that slice of the key index
+        prefixes = tuple(pattern.rstrip(':%') for pattern in key_patterns)
+        cursor.execute(
+            "SELECT " + ", ".join(
+                "(SELECT COUNT(*) FROM cursorDiskKV WHERE key >= ? || ':' AND key < ? || ';')" for _ in prefixes
+            ),
+            [param for prefix in prefixes for param in (prefix, prefix)],
+        )
+        counts = dict(zip(key_patterns, cursor.fetchone()))
+
         for pattern, (description, required) in key_patterns.items():
-            cursor.execute(f"SELECT COUNT(*) FROM cursorDiskKV WHERE key LIKE ?", (pattern,))
-            count = cursor.fetchone()[0]
+            count = counts[pattern]
             if count > 0:
                 console.print(f"   [green]✓ {description}[/green] ({count} records matching '{pattern}')")
             elif required:
@@ -385,47 +485,43 @@ def check_db():
         # 4. Validate JSON schema for sample records
         console.print("[bold]4. JSON Schema Validation[/bold]")
 
-        # Check composerData schema
-        console.print("   [bold]composerData:[/bold]")
-        cursor.execute("SELECT key, value FROM cursorDiskKV WHERE key LIKE 'composerData:%' LIMIT 5")
-        composer_rows = cursor.fetchall()
-        composer_fields = {
-            'required': ['composerId'],
-            'expected': ['createdAt', 'name', 'status', 'text'],
-            'optional': ['subtitle', 'modelConfig', 'isArchived', 'totalLinesAdded', 'totalLinesRemoved', 'codeBlockData']
-        }
-        if composer_rows:
-            _validate_json_schema(composer_rows, composer_fields, console, warnings, "composerData")
-        else:
-            console.print("      [yellow]No records to validate[/yellow]")
-
-        # Check bubbleId schema
-        console.print("   [bold]bubbleId:[/bold]")
-        cursor.execute("SELECT key, value FROM cursorDiskKV WHERE key LIKE 'bubbleId:%' LIMIT 5")
-        bubble_rows = cursor.fetchall()
-        bubble_fields = {
-            'required': ['bubbleId', 'type'],
-            'expected': ['createdAt', 'text'],
-            'optional': ['richText', 'toolResults', 'suggestedCodeBlocks', 'images', 'capabilities', 'context', 'modelInfo', 'thinking', 'thinkingDurationMs', 'toolFormerData']
-        }
-        if bubble_rows:
-            _validate_json_schema(bubble_rows, bubble_fields, console, warnings, "bubbleId")
-        else:
-            console.print("      [yellow]No records to validate[/yellow]")
-
-        # Check codeBlockDiff schema
-        console.print("   [bold]codeBlockDiff:[/bold]")
-        cursor.execute("SELECT key, value FROM cursorDiskKV WHERE key LIKE 'codeBlockDiff:%' LIMIT 5")
-        diff_rows = cursor.fetchall()
-        diff_fields = {
-            'required': [],
-            'expected': ['originalText', 'modifiedText'],
-            'optional': []
-        }
-        if diff_rows:
-            _validate_json_schema(diff_rows, diff_fields, console, warnings, "codeBlockDiff")
-        else:
-            console.print("      [dim]No records to validate (no code diffs)[/dim]")
+        schema_checks = [
+            ('composerData', {
+                'required': ['composerId'],
+                'expected': ['createdAt', 'name', 'status', 'text'],
+                'optional': ['subtitle', 'modelConfig', 'isArchived', 'totalLinesAdded', 'totalLinesRemoved', 'codeBlockData']
+            }, "[yellow]No records to validate[/yellow]"),
+            ('bubbleId', {
+                'required': ['bubbleId', 'type'],
+                'expected': ['createdAt', 'text'],
+                'optional': ['richText', 'toolResults', 'suggestedCodeBlocks', 'images', 'capabilities', 'context', 'modelInfo', 'thinking', 'thinkingDurationMs', 'toolFormerData']
+            }, "[yellow]No records to validate[/yellow]"),
+            ('codeBlockDiff', {
+                'required': [],
+                'expected': ['originalText', 'modifiedText'],
+                'optional': []
+            }, "[dim]No records to validate (no code diffs)[/dim]"),
+        ]
+
+        # Fetch a few sample records of every type in a single query
+        cursor.execute(
+            " UNION ALL ".join(
+                f"SELECT * FROM (SELECT ?, key, {_TOP_LEVEL_KEYS_SQL} FROM cursorDiskKV"
+                " WHERE key >= ? || ':' AND key < ? || ';' LIMIT 5)"
+                for _ in schema_checks
+            ),
+            [param for record_type, _, _ in schema_checks for param in (record_type,) * 3],
+        )
+        samples = {record_type: [] for record_type, _, _ in schema_checks}
+        for record_type, key, field_names in cursor.fetchall():
+            samples[record_type].append((key, field_names))
+
+        for record_type, field_spec, empty_message in schema_checks:
+            console.print(f"   [bold]{record_type}:[/bold]")
+            if samples[record_type]:
+                _validate_json_schema(samples[record_type], field_spec, console, warnings, record_type)
+            else:
+                console.print(f"      {empty_message}")
 
         conn.close()
         console.print()
@@ -437,25 +533,42 @@ def check_db():
     _print_check_db_summary(issues, warnings)
 
 
-def _validate_json_schema(rows: list, field_spec: dict, console: Console, warnings: list, record_type: str):
-    """Validate JSON records against expected schema."""
+# Top-level field names of a JSON value as a JSON array (NULL if the value isn't valid JSON).
+# Lets check-db inspect record shapes without decoding whole, potentially large, blobs in Python.
+_TOP_LEVEL_KEYS_SQL = (
+    "CASE WHEN json_valid(cursorDiskKV.value) THEN "
+    "(SELECT json_group_array(j.key) FROM json_each(cursorDiskKV.value) AS j) END"
+)
+
+
+def _validate_json_schema(rows: list, field_spec: dict, console: 'Console', warnings: list, record_type: str):
+    """Validate JSON records against expected schema.
+
+    Args:
+        rows: (key, top-level field names as a JSON array) pairs, as selected with _TOP_LEVEL_KEYS_SQL
+        field_spec: Dict of 'required', 'expected' and 'optional' field name lists
+        console: Console to report results to
+        warnings: List that warnings are appended to
+        record_type: Record type name used in warnings
+    """
     found_fields = set()
     missing_required = set()
     missing_expected = set()
 
-    for key, value in rows:
-        try:
-            data = json.loads(value)
-            found_fields.update(data.keys())
-
-            for field in field_spec['required']:
-                if field not in data:
-                    missing_required.add(field)
-            for field in field_spec['expected']:
-                if field not in data:
-                    missing_expected.add(field)
-        except json.JSONDecodeError:
+    for key, field_names in rows:
+        if field_names is None:
             warnings.append(f"Invalid JSON in {key}")
+            continue
+
+        fields = set(json.loads(field_names))
+        found_fields.update(fields)
+
+        for field in field_spec['required']:
+            if field not in fields:
+                missing_required.add(field)
+        for field in field_spec['expected']:
+            if field not in fields:
+                missing_expected.add(field)
 
     # Report required fields
     for field in field_spec['required']:
@@ -481,6 +594,8 @@ def _validate_json_schema(rows: list, field_spec: dict, console: Console, warnin
 
 def _print_check_db_summary(issues: list, warnings: list):
     """Print summary of database check."""
+    from rich.panel import Panel
+
     console.print()
     if issues:
         console.print(Panel.fit(
@@ -508,30 +623,33 @@ def _print_check_db_summary(issues: list, warnings: list):
 @main.command()
 def info():
     """Show information about Cursor's conversation storage."""
+    from rich.panel import Panel
+
     db_path = get_cursor_db_path()
+    try:
+        db_size = db_path.stat().st_size
+    except FileNotFoundError:
+        db_size = None
+    exists = db_size is not None
 
     console.print(Panel.fit(
         f"[bold]Database Location:[/bold]\n{db_path}\n\n"
-        f"[bold]Exists:[/bold] {db_path.exists()}\n"
-        f"[bold]Size:[/bold] {db_path.stat().st_size / 1024:.2f} KB" if db_path.exists() else "N/A",
+        f"[bold]Exists:[/bold] {exists}\n"
+        f"[bold]Size:[/bold] {f'{db_size / 1024:.2f} KB' if exists else 'N/A'}",
         title="[bold cyan]Cursor Storage Info[/bold cyan]"
     ))
 
-    if db_path.exists():
+    if exists:
         try:
-            db = CursorDatabase()
-            conversations = db.list_conversations()
-
-            total_messages = sum(c['message_count'] for c in conversations)
-            total_lines_added = sum(c.get('total_lines_added', 0) for c in conversations)
-            total_lines_removed = sum(c.get('total_lines_removed', 0) for c in conversations)
+            db = _get_db()
+            totals = db.get_stats()
 
             console.print()
             console.print(Panel.fit(
-                f"[bold]Total Conversations:[/bold] {len(conversations)}\n"
-                f"[bold]Total Messages:[/bold] {total_messages}\n"
-                f"[bold]Total Lines Added:[/bold] {total_lines_added}\n"
-                f"[bold]Total Lines Removed:[/bold] {total_lines_removed}",
+                f"[bold]Total Conversations:[/bold] {totals['conversation_count']}\n"
+                f"[bold]Total Messages:[/bold] {totals['message_count']}\n"
+                f"[bold]Total Lines Added:[/bold] {totals['total_lines_added']}\n"
+                f"[bold]Total Lines Removed:[/bold] {totals['total_lines_removed']}",
                 title="[bold cyan]Statistics[/bold cyan]"
             ))
 
@@ -541,12 +659,11 @@ def info():
 
 @main.command()
 @click.option('--all', 'show_all', is_flag=True, help='Include archived conversations')
-@click.option('--since', help='Stats for conversations since this time. Relative: "3d", "4w". Absolute: "2024-01-01"')
-@click.option('--before', help='Stats for conversations before this time (same format as --since)')
+@time_range_options('Stats for')
 @click.option('--by-week', is_flag=True, help='Show stats broken down by week')
 @click.option('--weeks', type=int, default=4, help='Number of weeks to show (with --by-week)')
-@click.option('--format', 'output_format', type=click.Choice(['rich', 'markdown']), default='rich')
-def stats(show_all: bool, since: str, before: str, by_week: bool, weeks: int, output_format: str):
+@format_option
+def stats(show_all: bool, since: Optional[datetime], before: Optional[datetime], by_week: bool, weeks: int, output_format: str):
     """Show conversation statistics.
 
     By default shows overall statistics. Use --by-week to see weekly breakdown.
@@ -558,12 +675,14 @@ def stats(show_all: bool, since: str, before: str, by_week: bool, weeks: int, ou
       ccs stats --by-week          # Weekly breakdown (last 4 weeks)
       ccs stats --by-week --weeks 8  # Weekly breakdown (last 8 weeks)
     """
-    try:
-        db = CursorDatabase()
-        conversations = db.list_conversations(since=since, before=before, include_empty=False)
+    from .stats import ConversationStats
 
-        if not show_all:
-            conversations = [c for c in conversations if not c['is_archived']]
+    try:
+        db = _get_db()
+        conversations = db.list_conversations(
+            since=since, before=before, include_empty=False,
+            archived=None if show_all else False
+        )
 
         if not conversations:
             console.print("[yellow]No conversations found.[/yellow]")
@@ -581,8 +700,9 @@ def stats(show_all: bool, since: str, before: str, by_week: bool, weeks: int, ou
         raise click.Abort()
 
 
-def _output_overall_stats(stats_calc: ConversationStats, output_format: str):
+def _output_overall_stats(stats_calc: 'ConversationStats', output_format: str):
     """Output overall statistics."""
+    from rich.panel import Panel
     from rich.table import Table
 
     result = stats_calc.compute(metric="message_count", label="Overall")
@@ -635,7 +755,7 @@ def _output_overall_stats(stats_calc: ConversationStats, output_format: str):
 
             for conv in top_convs:
                 date_str = conv['created'].strftime('%Y-%m-%d') if conv.get('created') else 'N/A'
-                title = conv['title'][:50] + '...' if len(conv['title']) > 50 else conv['title']
+                title = truncate_text(conv['title'], 53)
                 top_table.add_row(date_str, str(conv['message_count']), title)
 
             console.print(top_table)
@@ -668,13 +788,13 @@ def _output_overall_stats(stats_calc: ConversationStats, output_format: str):
             lines.append("|------|----------|-------|")
             for conv in top_convs:
                 date_str = conv['created'].strftime('%Y-%m-%d') if conv.get('created') else 'N/A'
-                title = conv['title'][:50] + '...' if len(conv['title']) > 50 else conv['title']
+                title = truncate_text(conv['title'], 53)
                 lines.append(f"| {date_str} | {conv['message_count']} | {title} |")
 
-        print('\n'.join(lines))
+        _write_lines(lines)
 
 
-def _output_weekly_stats(stats_calc: ConversationStats, num_weeks: int, output_format: str):
+def _output_weekly_stats(stats_calc: 'ConversationStats', num_weeks: int, output_format: str):
     """Output weekly statistics breakdown."""
     from rich.table import Table
 
@@ -725,12 +845,12 @@ def _output_weekly_stats(stats_calc: ConversationStats, num_weeks: int, output_f
         console.print()
         dist_table = Table(title="Distribution by Week")
         dist_table.add_column("Week", style="cyan")
-        for bucket in ConversationStats.DEFAULT_BUCKETS:
+        for bucket in stats_calc.DEFAULT_BUCKETS:
             dist_table.add_column(bucket[0], justify="right")
 
         for r in results:
             row = [r.label.split(" (")[0]]  # Just the label without date range
-            for bucket_name, _, _ in ConversationStats.DEFAULT_BUCKETS:
+            for bucket_name, _, _ in stats_calc.DEFAULT_BUCKETS:
                 row.append(str(r.distribution.get(bucket_name, 0)))
             dist_table.add_row(*row)
 
@@ -751,16 +871,16 @@ def _output_weekly_stats(stats_calc: ConversationStats, num_weeks: int, output_f
             lines.append(f"| {r.label} | {r.count} | {r.total} | {mean_str} | {median_str} | {p90_str} | {max_str} |")
 
         lines.append("\n## Distribution\n")
-        bucket_headers = " | ".join(b[0] for b in ConversationStats.DEFAULT_BUCKETS)
+        bucket_headers = " | ".join(b[0] for b in stats_calc.DEFAULT_BUCKETS)
         lines.append(f"| Week | {bucket_headers} |")
-        lines.append("|------|" + "|".join(["-----:" for _ in ConversationStats.DEFAULT_BUCKETS]) + "|")
+        lines.append("|------|" + "|".join(["-----:" for _ in stats_calc.DEFAULT_BUCKETS]) + "|")
 
         for r in results:
             label = r.label.split(" (")[0]
-            counts = " | ".join(str(r.distribution.get(b[0], 0)) for b in ConversationStats.DEFAULT_BUCKETS)
+            counts = " | ".join(str(r.distribution.get(b[0], 0)) for b in stats_calc.DEFAULT_BUCKETS)
             lines.append(f"| {label} | {counts} |")
 
-        print('\n'.join(lines))
+        _write_lines(lines)
 
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 """Database interface for reading Cursor conversations."""
 
+import functools
 import json
 import os
 import re
@@ -7,9 +8,13 @@ import sqlite3
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from .datetime_utils import filter_by_time_range
+from .datetime_utils import TimeSpec, parse_time_range
+
+
+# Match quoted strings or non-whitespace sequences
+_SEARCH_TERM_RE = re.compile(r'"([^"]+)"|(\S+)')
 
 
 def parse_search_query(query: str) -> List[str]:
@@ -33,17 +38,106 @@ def parse_search_query(query: str) -> List[str]:
         >>> parse_search_query('"hello world" foo "bar baz"')
         ['hello world', 'foo', 'bar baz']
     """
-    terms = []
-    # Match quoted strings or non-whitespace sequences
-    pattern = r'"([^"]+)"|(\S+)'
-    for match in re.finditer(pattern, query):
-        # Group 1 is quoted content (without quotes), group 2 is unquoted word
-        term = match.group(1) if match.group(1) is not None else match.group(2)
-        if term:  # Skip empty strings
-            terms.append(term)
-    return terms
+    # Group 1 is quoted content (without quotes), group 2 is unquoted word;
+    # whichever one matched is non-empty
+    return [match.group(1) or match.group(2) for match in _SEARCH_TERM_RE.finditer(query)]
+
+
+# A message is non-empty if it has non-empty text, OR it has associated code
+# blocks (found via json_tree over the conversation's nested codeBlockData).
+# Messages are selected by key range so SQLite can use the index on ``key``,
+# and each conversation's codeBlockData is walked once rather than per message.
+#
+# Condition on the conversation row aliased as ``c``: it has a non-empty message.
+# Text is checked first, so codeBlockData is only walked for conversations
+# without any text message.
+_HAS_MESSAGES_SQL = '''(
+    EXISTS (
+        SELECT 1 FROM cursorDiskKV b
+        WHERE b.key >= 'bubbleId:' || SUBSTR(c.key, 14) || ':'
+          AND b.key < 'bubbleId:' || SUBSTR(c.key, 14) || ';'
+          AND TRIM(COALESCE(json_extract(b.value, '$.text'), '')) != ''
+    )
+    OR EXISTS (
+        SELECT json_extract(b.value, '$.bubbleId') FROM cursorDiskKV b
+        WHERE b.key >= 'bubbleId:' || SUBSTR(c.key, 14) || ':'
+          AND b.key < 'bubbleId:' || SUBSTR(c.key, 14) || ';'
+        INTERSECT
+        SELECT jt.value FROM json_tree(c.value, '$.codeBlockData') AS jt
+        WHERE jt.key = 'bubbleId' AND jt.value IS NOT NULL
+    )
+)'''
+
+# CTEs counting the non-empty messages of every conversation in a preceding
+# ``conversations`` CTE (one composerData ``key`` per row), as message_counts
+# (composer_key, msg_count). Conversations without any have no row.
+_MESSAGE_COUNTS_CTE = '''
+    code_block_bubbles AS (
+        SELECT DISTINCT c.key AS composer_key, jt.value AS bubble_id
+        FROM conversations c
+        JOIN cursorDiskKV v ON v.key = c.key,
+            json_tree(v.value, '$.codeBlockData') AS jt
+        WHERE jt.key = 'bubbleId'
+    ),
+    message_counts AS (
+        SELECT c.key AS composer_key, COUNT(*) AS msg_count
+        FROM conversations c
+        JOIN cursorDiskKV b
+            ON b.key >= 'bubbleId:' || SUBSTR(c.key, 14) || ':'
+            AND b.key < 'bubbleId:' || SUBSTR(c.key, 14) || ';'
+        LEFT JOIN code_block_bubbles cb
+            ON cb.composer_key = c.key AND cb.bubble_id = json_extract(b.value, '$.bubbleId')
+        WHERE TRIM(COALESCE(json_extract(b.value, '$.text'), '')) != ''
+           OR cb.bubble_id IS NOT NULL
+        GROUP BY c.key
+    )
+'''
+
+
+# composerData fields needed for conversation listings, in the order
+# _fetch_conversations() unpacks them
+_LIST_FIELDS_SQL = ', '.join(f"'$.{path}'" for path in (
+    'composerId', 'name', 'subtitle', 'createdAt', 'status', 'text',
+    'modelConfig.modelName', 'isArchived', 'totalLinesAdded', 'totalLinesRemoved',
+))
+
+
+# Per-connection tuning for read-only access: memory-map up to 256 MB of the
+# file, use a 64 MB page cache and keep temporary sort/index data in memory.
+_READ_PRAGMAS = (
+    'query_only = 1',
+    'mmap_size = 268435456',
+    'cache_size = -65536',
+    'temp_store = MEMORY',
+)
+
+
+def _like_pattern(term: str) -> str:
+    """Build a LIKE pattern matching ``term`` anywhere, for use with ESCAPE '\\'."""
+    # Escape % and _ for LIKE pattern, then wrap with %
+    term_escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{term_escaped}%'
+
+
+def _unicode_lower(value: Any) -> Any:
+    """SQL function lowercasing text with Python's full Unicode case mapping.
+
+    SQLite's own LOWER() and LIKE only fold ASCII letters.
+    """
+    return value.lower() if isinstance(value, str) else value
 
 
+def _stored_verbatim_in_json(term: str) -> bool:
+    """Whether ``term`` appears unescaped in the JSON text of any string containing it.
+
+    Cursor's JSON (JSON.stringify) escapes only quotes, backslashes and control
+    characters, and other serializers may also escape non-ASCII; printable ASCII
+    without quotes or backslashes is always written as-is.
+    """
+    return all(' ' <= ch <= '~' and ch not in '"\\' for ch in term)
+
+
+@functools.cache
 def get_cursor_db_path() -> Path:
     """Get the path to Cursor's global state database.
 
@@ -64,8 +158,31 @@ def get_cursor_db_path() -> Path:
         return Path.home() / ".config" / "Cursor" / "User" / "globalStorage" / "state.vscdb"
 
 
+def connect_read_only(db_path: Path) -> sqlite3.Connection:
+    """Open a read-only connection to Cursor's database, tuned for reads.
+
+    Args:
+        db_path: Path to the database file.
+
+    Returns:
+        SQLite connection opened with mode=ro and _READ_PRAGMAS applied.
+    """
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    for pragma in _READ_PRAGMAS:
+        conn.execute(f'PRAGMA {pragma}')
+    return conn
+
+
 class CursorDatabase:
-    """Interface to Cursor's conversation database."""
+    """Interface to Cursor's conversation database.
+
+    The read-only connection is opened on first use and kept until close();
+    use the instance as a context manager to close it when done.
+
+    Examples:
+        >>> with CursorDatabase() as db:
+        ...     recent = db.list_conversations(limit=10)
+    """
 
     def __init__(self, db_path: Optional[Path] = None):
         """Initialize database connection.
@@ -76,98 +193,265 @@ class CursorDatabase:
         self.db_path = db_path or get_cursor_db_path()
         if not self.db_path.exists():
             raise FileNotFoundError(f"Cursor database not found at {self.db_path}")
+        self._conn: Optional[sqlite3.Connection] = None
 
     def _connect(self) -> sqlite3.Connection:
-        """Create a read-only database connection."""
-        return sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True)
+        """Get the read-only database connection, opening it on first use.
+
+        One connection is shared by all queries on this instance, so the
+        PRAGMAs and SQLite's prepared-statement cache are set up only once.
+
+        The database belongs to Cursor and is opened with mode=ro, so the
+        journal mode is left as Cursor configured it; only per-connection
+        read tuning is applied.
+        """
+        if self._conn is None:
+            self._conn = connect_read_only(self.db_path)
+            self._conn.create_function('unicode_lower', 1, _unicode_lower, deterministic=True)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection, if one is open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> 'CursorDatabase':
+        """Return this instance for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the database connection when the ``with`` block exits."""
+        self.close()
 
     def list_conversations(
-        self, since: Optional[str] = None, before: Optional[str] = None, include_empty: bool = False
+        self, since: Optional[TimeSpec] = None, before: Optional[TimeSpec] = None,
+        include_empty: bool = False, archived: Optional[bool] = None,
+        limit: Optional[int] = None, offset: int = 0
     ) -> List[Dict[str, Any]]:
         """List all conversations (composers) in the database.
 
+        Filtering, ordering and pagination all happen in SQL, so only the rows
+        that are returned get JSON-decoded.
+
         Args:
             since: Filter conversations created since this time (e.g., "3 days", "2024-01-01")
             before: Filter conversations created before this time
             include_empty: Include empty conversations (status="none" with 0 messages). Default: False
+            archived: If False, exclude archived conversations; if True, only archived ones.
+                None (default) returns both.
+            limit: Maximum number of conversations to return. None for no limit.
+            offset: Number of conversations to skip (for pagination).
+
+        Returns:
+            List of conversation dictionaries with metadata, newest first.
+        """
+        where_sql, params = self._conversation_filters(since, before, include_empty, archived)
+        return self._fetch_conversations(where_sql, params, limit=limit, offset=offset)
+
+    def _fetch_conversations(
+        self, where_sql: str, params: List[Any], limit: Optional[int] = None, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Fetch and decode conversations matching a WHERE clause.
+
+        Args:
+            where_sql: SQL condition on composerData rows aliased as ``c``.
+            params: Bind parameters for ``where_sql``.
+            limit: Maximum number of conversations to return. None for no limit.
+            offset: Number of conversations to skip.
+
+        Returns:
+            List of conversation dictionaries with metadata, newest first.
+        """
+        return self._fetch_conversation_page(
+            where_sql, params, limit=limit, offset=offset, count_total=False
+        )[0]
+
+    def _fetch_conversation_page(
+        self, where_sql: str, params: List[Any], limit: Optional[int] = None, offset: int = 0,
+        count_total: bool = True
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Fetch one page of conversations plus the total number of matches.
+
+        The total comes from a window function evaluated in the same query, so
+        expensive filters (e.g. search terms) are not run a second time just to
+        count. It is 0 when the requested page is past the last match.
+
+        Args:
+            where_sql: SQL condition on composerData rows aliased as ``c``.
+            params: Bind parameters for ``where_sql``.
+            limit: Maximum number of conversations to return. None for no limit.
+            offset: Number of conversations to skip.
+            count_total: Compute the total. The window function forces a full sort
+                instead of a top-N one, so skip it when the caller doesn't need it.
 
         Returns:
-            List of conversation dictionaries with metadata.
+            Tuple of (conversation dictionaries newest first, total matching conversations).
         """
-        conn = self._connect()
-        cursor = conn.cursor()
-
-        # Count non-empty messages per conversation:
-        # - Messages with non-empty text, OR
-        # - Messages that have associated code blocks
-        # Uses json_tree to efficiently find bubbleId values in nested codeBlockData
-        join_type = "LEFT JOIN" if include_empty else "JOIN"
+        cursor = self._connect().cursor()
+
+        # Page through conversations first, then count messages for just that page.
+        # Only the listed fields are extracted (as one small JSON array) so the full
+        # composerData blob, which includes codeBlockData etc., is never decoded in Python.
         cursor.execute(f'''
             WITH
-            messages AS (
+            conversations AS (
                 SELECT
-                    SUBSTR(key, 10, INSTR(SUBSTR(key, 10), ':') - 1) as composer_id,
-                    json_extract(value, '$.bubbleId') as bubble_id,
-                    CASE WHEN TRIM(COALESCE(json_extract(value, '$.text'), '')) != ''
-                         THEN 1 ELSE 0 END as has_text
-                FROM cursorDiskKV
-                WHERE key LIKE 'bubbleId:%'
-            ),
-            code_block_bubbles AS (
-                SELECT DISTINCT
-                    SUBSTR(c.key, 14) as composer_id,
-                    jt.value as bubble_id
-                FROM cursorDiskKV c,
-                    json_tree(c.value, '$.codeBlockData') as jt
-                WHERE c.key LIKE 'composerData:%'
-                  AND jt.key = 'bubbleId'
+                    c.key,
+                    json_extract(c.value, {_LIST_FIELDS_SQL}) as fields,
+                    json_extract(c.value, '$.createdAt') as created_at,
+                    {'COUNT(*) OVER ()' if count_total else '0'} as total
+                FROM cursorDiskKV c
+                WHERE {where_sql}
+                ORDER BY created_at DESC
+                LIMIT ? OFFSET ?
             ),
-            non_empty_counts AS (
-                SELECT
-                    m.composer_id,
-                    COUNT(*) as msg_count
-                FROM messages m
-                LEFT JOIN code_block_bubbles cb
-                    ON m.composer_id = cb.composer_id AND m.bubble_id = cb.bubble_id
-                WHERE m.has_text = 1 OR cb.bubble_id IS NOT NULL
-                GROUP BY m.composer_id
-            )
-            SELECT c.key, c.value, COALESCE(n.msg_count, 0) as msg_count
-            FROM cursorDiskKV c
-            {join_type} non_empty_counts n ON SUBSTR(c.key, 14) = n.composer_id
-            WHERE c.key LIKE 'composerData:%' AND c.value IS NOT NULL
-        ''')
+            {_MESSAGE_COUNTS_CTE}
+            SELECT c.key, c.fields, COALESCE(n.msg_count, 0), c.total
+            FROM conversations c
+            LEFT JOIN message_counts n ON n.composer_key = c.key
+            ORDER BY c.created_at DESC
+        ''', (*params, limit if limit is not None else -1, offset))
+
+        rows = cursor.fetchall()
+        # Every row carries the same window total; there is none past the last page
+        total = rows[0][3] if rows else 0
 
         conversations = []
-        for row in cursor.fetchall():
-            data = json.loads(row[1])
-            composer_id = data.get('composerId', row[0].split(':')[1])
-            created_at = data.get('createdAt', 0)
-            msg_count = row[2]
+        for key, fields, msg_count, _ in rows:
+            (composer_id, name, subtitle, created_at, status, text, model_name,
+             is_archived, lines_added, lines_removed) = json.loads(fields)
+            # Missing and null fields both come back as None from json_extract
+            composer_id = composer_id or key.split(':')[1]
 
             conversations.append({
                 'id': composer_id,
-                'title': data.get('name', '(no title)'),
-                'subtitle': data.get('subtitle', ''),
+                'title': name if name is not None else '(no title)',
+                'subtitle': subtitle if subtitle is not None else '',
                 'created': datetime.fromtimestamp(created_at / 1000) if created_at else None,
                 'message_count': msg_count,
-                'status': data.get('status', 'unknown'),
-                'preview': data.get('text', '')[:100],
-                'model': data.get('modelConfig', {}).get('modelName', 'unknown'),
-                'is_archived': data.get('isArchived', False),
-                'total_lines_added': data.get('totalLinesAdded', 0),
-                'total_lines_removed': data.get('totalLinesRemoved', 0),
+                'status': status if status is not None else 'unknown',
+                'preview': (text or '')[:100],
+                'model': model_name if model_name is not None else 'unknown',
+                'is_archived': bool(is_archived),
+                'total_lines_added': lines_added or 0,
+                'total_lines_removed': lines_removed or 0,
             })
 
-        conn.close()
+        return conversations, total
 
-        # Apply time filtering if requested
-        if since or before:
-            conversations = filter_by_time_range(conversations, since=since, before=before)
+    def count_conversations(
+        self, since: Optional[TimeSpec] = None, before: Optional[TimeSpec] = None,
+        include_empty: bool = False, archived: Optional[bool] = None
+    ) -> int:
+        """Count conversations matching the same filters as list_conversations().
 
-        return sorted(
-            conversations, key=lambda x: x['created'] if x['created'] else datetime.min, reverse=True
-        )
+        Args:
+            since: Filter conversations created since this time
+            before: Filter conversations created before this time
+            include_empty: Include empty conversations. Default: False
+            archived: If False, exclude archived conversations; if True, only archived ones.
+
+        Returns:
+            Number of matching conversations.
+        """
+        where_sql, params = self._conversation_filters(since, before, include_empty, archived)
+
+        cursor = self._connect().cursor()
+
+        cursor.execute(f'SELECT COUNT(*) FROM cursorDiskKV c WHERE {where_sql}', params)
+        count = cursor.fetchone()[0]
+
+        return count
+
+    def get_stats(
+        self, since: Optional[TimeSpec] = None, before: Optional[TimeSpec] = None,
+        include_empty: bool = False, archived: Optional[bool] = None
+    ) -> Dict[str, int]:
+        """Compute totals across conversations in a single aggregate query.
+
+        Args:
+            since: Filter conversations created since this time
+            before: Filter conversations created before this time
+            include_empty: Include empty conversations. Default: False
+            archived: If False, exclude archived conversations; if True, only archived ones.
+
+        Returns:
+            Dictionary with conversation_count, message_count, total_lines_added
+            and total_lines_removed.
+        """
+        where_sql, params = self._conversation_filters(since, before, include_empty, archived)
+
+        cursor = self._connect().cursor()
+
+        cursor.execute(f'''
+            WITH
+            conversations AS (
+                SELECT
+                    c.key,
+                    json_extract(c.value, '$.totalLinesAdded') as lines_added,
+                    json_extract(c.value, '$.totalLinesRemoved') as lines_removed
+                FROM cursorDiskKV c
+                WHERE {where_sql}
+            ),
+            {_MESSAGE_COUNTS_CTE}
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(n.msg_count), 0),
+                COALESCE(SUM(c.lines_added), 0),
+                COALESCE(SUM(c.lines_removed), 0)
+            FROM conversations c
+            LEFT JOIN message_counts n ON n.composer_key = c.key
+        ''', params)
+        row = cursor.fetchone()
+
+        return {
+            'conversation_count': row[0],
+            'message_count': row[1],
+            'total_lines_added': row[2],
+            'total_lines_removed': row[3],
+        }
+
+    @staticmethod
+    def _conversation_filters(
+        since: Optional[TimeSpec], before: Optional[TimeSpec], include_empty: bool,
+        archived: Optional[bool]
+    ) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause for composerData rows aliased as ``c``.
+
+        Args:
+            since: Filter conversations created since this time
+            before: Filter conversations created before this time
+            include_empty: Include conversations without non-empty messages
+            archived: Archived-state filter (None for no filtering)
+
+        Returns:
+            Tuple of (SQL condition, bind parameters).
+        """
+        # Key range rather than LIKE: LIKE is case-insensitive, so SQLite cannot use the key
+        # index for it and would scan every bubble and diff row to find the composers
+        conditions = ["c.key >= 'composerData:'", "c.key < 'composerData;'", "c.value IS NOT NULL"]
+        params: List[Any] = []
+
+        if not include_empty:
+            conditions.append(_HAS_MESSAGES_SQL)
+
+        since_dt, before_dt = parse_time_range(since, before)
+        if since_dt or before_dt:
+            # Conversations without a creation time never match a time filter
+            conditions.append("json_extract(c.value, '$.createdAt') > 0")
+        if since_dt:
+            conditions.append("json_extract(c.value, '$.createdAt') >= ?")
+            params.append(since_dt.timestamp() * 1000)
+        if before_dt:
+            conditions.append("json_extract(c.value, '$.createdAt') < ?")
+            params.append(before_dt.timestamp() * 1000)
+
+        if archived is not None:
+            conditions.append("COALESCE(json_extract(c.value, '$.isArchived'), 0) = ?")
+            params.append(1 if archived else 0)
+
+        return " AND ".join(conditions), params
 
     def get_conversation(self, composer_id: str) -> Dict[str, Any]:
         """Get metadata for a specific conversation.
@@ -178,18 +462,15 @@ class CursorDatabase:
         Returns:
             Dictionary with conversation metadata.
         """
-        conn = self._connect()
-        cursor = conn.cursor()
+        cursor = self._connect().cursor()
 
-        cursor.execute(f'SELECT value FROM cursorDiskKV WHERE key = "composerData:{composer_id}"')
+        cursor.execute("SELECT value FROM cursorDiskKV WHERE key = 'composerData:' || ?", (composer_id,))
         row = cursor.fetchone()
 
         if not row:
-            conn.close()
             raise ValueError(f"Conversation {composer_id} not found")
 
         data = json.loads(row[0])
-        conn.close()
         return data
 
     def get_messages(self, composer_id: str) -> List[Dict[str, Any]]:
@@ -201,57 +482,95 @@ class CursorDatabase:
         Returns:
             List of message dictionaries sorted by creation time.
         """
-        conn = self._connect()
-        cursor = conn.cursor()
+        cursor = self._connect().cursor()
 
-        cursor.execute(
-            f'SELECT key, value FROM cursorDiskKV WHERE key LIKE "bubbleId:{composer_id}:%"'
-        )
+        # A key range (rather than LIKE) lets SQLite seek the index on key
+        cursor.execute('''
+            SELECT key, value FROM cursorDiskKV
+            WHERE key >= 'bubbleId:' || ? || ':' AND key < 'bubbleId:' || ? || ';'
+        ''', (composer_id, composer_id))
+
+        messages = [self._parse_message(json.loads(row[1])) for row in cursor.fetchall()]
+
+        return self._sort_messages(messages)
+
+    def get_conversation_with_messages(self, composer_id: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Get a conversation's metadata and all of its messages in one query.
+
+        Equivalent to calling get_conversation() and get_messages(), but reads
+        the composerData row and the bubble key range in a single round trip.
+
+        Args:
+            composer_id: The conversation ID.
 
+        Returns:
+            Tuple of (conversation metadata dict, messages sorted by creation time).
+        """
+        cursor = self._connect().cursor()
+
+        cursor.execute('''
+            SELECT key, value FROM cursorDiskKV
+            WHERE key = 'composerData:' || ?
+               OR (key >= 'bubbleId:' || ? || ':' AND key < 'bubbleId:' || ? || ';')
+        ''', (composer_id, composer_id, composer_id))
+
+        conversation = None
         messages = []
-        for row in cursor.fetchall():
-            data = json.loads(row[1])
-            # Extract per-message model info if available
-            model_info = data.get('modelInfo', {})
-            model_name = model_info.get('modelName') if model_info else None
-
-            # Extract thinking data (extended thinking / reasoning traces)
-            thinking_data = data.get('thinking')
-            thinking_text = None
-            if thinking_data and isinstance(thinking_data, dict):
-                thinking_text = thinking_data.get('text')
-
-            # Extract tool call data (toolFormerData contains actual tool invocations)
-            tool_former_data = data.get('toolFormerData')
-
-            messages.append({
-                'id': data.get('bubbleId'),
-                'type': 'user' if data.get('type') == 1 else 'assistant',
-                'created': data.get('createdAt'),
-                'text': data.get('text', ''),
-                'rich_text': data.get('richText', ''),
-                'model': model_name,  # Per-message model (None, "default", or specific model name)
-                # Thinking / reasoning traces
-                'thinking': thinking_text,
-                'thinking_duration_ms': data.get('thinkingDurationMs'),
-                # Tool calls (actual tool invocations, not just results)
-                'tool_call': tool_former_data,
-                # Additional context
-                'tool_results': data.get('toolResults', []),
-                'suggested_code_blocks': data.get('suggestedCodeBlocks', []),
-                'images': data.get('images', []),
-                'capabilities': data.get('capabilities', []),
-                'context': data.get('context', {}),
-            })
+        for key, value in cursor.fetchall():
+            if key.startswith('composerData:'):
+                conversation = json.loads(value) if value is not None else None
+            else:
+                messages.append(self._parse_message(json.loads(value)))
 
-        conn.close()
+        if conversation is None:
+            raise ValueError(f"Conversation {composer_id} not found")
 
-        # Sort by creation time
+        return conversation, self._sort_messages(messages)
+
+    @staticmethod
+    def _parse_message(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a raw bubble JSON object into a message dictionary."""
+        # Extract per-message model info if available
+        model_info = data.get('modelInfo', {})
+        model_name = model_info.get('modelName') if model_info else None
+
+        # Extract thinking data (extended thinking / reasoning traces)
+        thinking_data = data.get('thinking')
+        thinking_text = None
+        if thinking_data and isinstance(thinking_data, dict):
+            thinking_text = thinking_data.get('text')
+
+        # Extract tool call data (toolFormerData contains actual tool invocations)
+        tool_former_data = data.get('toolFormerData')
+
+        return {
+            'id': data.get('bubbleId'),
+            'type': 'user' if data.get('type') == 1 else 'assistant',
+            'created': data.get('createdAt'),
+            'text': data.get('text', ''),
+            'rich_text': data.get('richText', ''),
+            'model': model_name,  # Per-message model (None, "default", or specific model name)
+            # Thinking / reasoning traces
+            'thinking': thinking_text,
+            'thinking_duration_ms': data.get('thinkingDurationMs'),
+            # Tool calls (actual tool invocations, not just results)
+            'tool_call': tool_former_data,
+            # Additional context
+            'tool_results': data.get('toolResults', []),
+            'suggested_code_blocks': data.get('suggestedCodeBlocks', []),
+            'images': data.get('images', []),
+            'capabilities': data.get('capabilities', []),
+            'context': data.get('context', {}),
+        }
+
+    @staticmethod
+    def _sort_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sort messages by creation time."""
         return sorted(messages, key=lambda x: x['created'] if x['created'] else '')
 
     def search_conversations(
-        self, query: str, since: Optional[str] = None, before: Optional[str] = None,
-        include_empty: bool = False, search_diffs: bool = False
+        self, query: str, since: Optional[TimeSpec] = None, before: Optional[TimeSpec] = None,
+        include_empty: bool = False, search_diffs: bool = False, archived: Optional[bool] = None
     ) -> List[Dict[str, Any]]:
         """Search conversations by text content.
 
@@ -270,141 +589,169 @@ class CursorDatabase:
             before: Filter conversations created before this time
             include_empty: Include empty conversations. Default: False
             search_diffs: Also search in code diffs (file paths and diff content). Default: False
+            archived: If False, exclude archived conversations; if True, only archived ones.
+                None (default) returns both.
 
         Returns:
             List of matching conversations.
         """
+        return self.search_conversations_page(
+            query, since=since, before=before, include_empty=include_empty,
+            search_diffs=search_diffs, archived=archived
+        )[0]
+
+    def search_conversations_page(
+        self, query: str, since: Optional[TimeSpec] = None, before: Optional[TimeSpec] = None,
+        include_empty: bool = False, search_diffs: bool = False, archived: Optional[bool] = None,
+        limit: Optional[int] = None, offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Search conversations and return one page of results plus the total match count.
+
+        Takes the same query syntax and filters as search_conversations().
+
+        Args:
+            query: Search query string (keywords and/or quoted phrases).
+            since: Filter conversations created since this time
+            before: Filter conversations created before this time
+            include_empty: Include empty conversations. Default: False
+            search_diffs: Also search in code diffs (file paths and diff content). Default: False
+            archived: If False, exclude archived conversations; if True, only archived ones.
+            limit: Maximum number of conversations to return. None for no limit.
+            offset: Number of conversations to skip (for pagination).
+
+        Returns:
+            Tuple of (matching conversations on this page, total number of matches).
+            The total is 0 if the page is past the last match.
+        """
         terms = parse_search_query(query)
         if not terms:
-            return []
-
-        conn = self._connect()
-        cursor = conn.cursor()
+            return [], 0
 
-        # Find IDs matching each term, then intersect
-        matching_ids: Optional[set] = None
+        # Every term must match somewhere in the conversation (AND logic), so
+        # each one becomes its own predicate on the conversation row
+        where_sql, params = self._conversation_filters(since, before, include_empty, archived)
         for term in terms:
-            term_ids = self._find_ids_for_term(cursor, term, search_diffs)
-            if matching_ids is None:
-                matching_ids = term_ids
-            else:
-                matching_ids &= term_ids
-            # Early exit if no matches
-            if not matching_ids:
-                conn.close()
-                return []
-
-        conn.close()
+            term_sql, term_params = self._term_filter(term, search_diffs)
+            where_sql += f" AND {term_sql}"
+            params.extend(term_params)
 
-        # Get full conversation data for matching IDs and apply filters
-        all_conversations = self.list_conversations(since=since, before=before, include_empty=include_empty)
-        results = [conv for conv in all_conversations if conv['id'] in matching_ids]
+        return self._fetch_conversation_page(where_sql, params, limit=limit, offset=offset)
 
-        return results
+    @staticmethod
+    def _term_filter(term: str, search_diffs: bool) -> Tuple[str, List[Any]]:
+        """Build the SQL condition matching a single search term.
 
-    def _find_ids_for_term(
-        self, cursor: sqlite3.Cursor, term: str, search_diffs: bool
-    ) -> set:
-        """Find conversation IDs matching a single search term.
+        Messages and code diffs are looked up by key range within the
+        conversation, so SQLite can use the index on ``key`` and stop at the
+        first hit. SQLite's LIKE already ignores ASCII case, so columns are
+        compared as stored rather than copied through LOWER() for every row.
 
         Args:
-            cursor: Database cursor.
             term: Single search term (keyword or phrase).
             search_diffs: Also search in code diffs.
 
         Returns:
-            Set of composer IDs matching the term.
+            Tuple of (SQL condition on composerData rows aliased as ``c``, bind parameters).
         """
-        # Escape % and _ for LIKE pattern, then wrap with %
-        term_escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
-        like_pattern = f'%{term_escaped}%'
+        like_pattern = _like_pattern(term)
 
-        # Find matching composer IDs using SQL with JSON operators
         # Search in metadata: title (name), subtitle, and preview (text)
-        cursor.execute('''
-            SELECT DISTINCT SUBSTR(key, 14) as composer_id
-            FROM cursorDiskKV
-            WHERE key LIKE 'composerData:%'
-              AND (
-                LOWER(value ->> '$.name') LIKE LOWER(?) ESCAPE '\\'
-                OR LOWER(value ->> '$.subtitle') LIKE LOWER(?) ESCAPE '\\'
-                OR LOWER(value ->> '$.text') LIKE LOWER(?) ESCAPE '\\'
-              )
-        ''', (like_pattern, like_pattern, like_pattern))
-        matching_ids = {row[0] for row in cursor.fetchall()}
-
-        # Search in message text
-        cursor.execute('''
-            SELECT DISTINCT SUBSTR(key, 10, INSTR(SUBSTR(key, 10), ':') - 1) as composer_id
-            FROM cursorDiskKV
-            WHERE key LIKE 'bubbleId:%'
-              AND LOWER(value ->> '$.text') LIKE LOWER(?) ESCAPE '\\'
-        ''', (like_pattern,))
-        matching_ids.update(row[0] for row in cursor.fetchall())
+        conditions = [
+            "c.value ->> '$.name' LIKE ? ESCAPE '\\'",
+            "c.value ->> '$.subtitle' LIKE ? ESCAPE '\\'",
+            "c.value ->> '$.text' LIKE ? ESCAPE '\\'",
+        ]
+        params = [like_pattern] * 3
+
+        # Search in message text. When the term is stored verbatim in JSON, a
+        # LIKE over the raw value first rejects most bubbles without parsing them
+        raw_filter = ''
+        if _stored_verbatim_in_json(term):
+            raw_filter = "AND b.value LIKE ? ESCAPE '\\'"
+            params.append(like_pattern)
+        conditions.append(f'''EXISTS (
+            SELECT 1 FROM cursorDiskKV b
+            WHERE b.key >= 'bubbleId:' || SUBSTR(c.key, 14) || ':'
+              AND b.key < 'bubbleId:' || SUBSTR(c.key, 14) || ';'
+              {raw_filter}
+              AND b.value ->> '$.text' LIKE ? ESCAPE '\\'
+        )''')
+        params.append(like_pattern)
 
         # Search in code diffs if enabled
         if search_diffs:
-            matching_ids.update(self._search_code_diffs_sql(cursor, like_pattern))
-
-        return matching_ids
-
-    def _search_code_diffs_sql(self, cursor: sqlite3.Cursor, like_pattern: str) -> set:
-        """Search code diffs using SQL.
+            # codeBlockData file paths (keys of the codeBlockData object)
+            conditions.append('''EXISTS (
+                SELECT 1 FROM json_each(c.value ->> '$.codeBlockData') AS cbd
+                WHERE cbd.key LIKE ? ESCAPE '\\'
+            )''')
+            params.append(like_pattern)
+            # codeBlockDiff entries (originalText, modifiedText, and diff content)
+            conditions.append('''EXISTS (
+                SELECT 1 FROM cursorDiskKV d
+                WHERE d.key >= 'codeBlockDiff:' || SUBSTR(c.key, 14) || ':'
+                  AND d.key < 'codeBlockDiff:' || SUBSTR(c.key, 14) || ';'
+                  AND (
+                    d.value ->> '$.originalText' LIKE ? ESCAPE '\\'
+                    OR d.value ->> '$.modifiedText' LIKE ? ESCAPE '\\'
+                    OR d.value LIKE ? ESCAPE '\\'
+                  )
+            )''')
+            params.extend([like_pattern] * 3)
+
+        return "(" + " OR ".join(conditions) + ")", params
+
+    def find_by_id(
+        self, id_query: str, since: Optional[TimeSpec] = None, before: Optional[TimeSpec] = None,
+        include_empty: bool = False, exact: bool = False, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find conversations by full or partial ID.
 
         Args:
-            cursor: Database cursor.
-            like_pattern: LIKE pattern with wildcards (e.g., '%query%').
+            id_query: Full conversation ID, or any part of one.
+            since: Filter conversations created since this time
+            before: Filter conversations created before this time
+            include_empty: Include empty conversations. Default: False
+            exact: Only match the full ID (a direct key lookup). Default: False
+            limit: Maximum number of conversations to return. None for no limit.
 
         Returns:
-            Set of composer IDs that have matching diffs.
+            List of conversations whose ID matches, newest first.
         """
-        matching_ids = set()
-
-        # Search in codeBlockData file paths (keys of the codeBlockData object)
-        # Using json_each to iterate over the keys
-        cursor.execute('''
-            SELECT DISTINCT SUBSTR(kv.key, 14) as composer_id
-            FROM cursorDiskKV kv, json_each(kv.value ->> '$.codeBlockData') as cbd
-            WHERE kv.key LIKE 'composerData:%'
-              AND kv.value ->> '$.codeBlockData' IS NOT NULL
-              AND LOWER(cbd.key) LIKE LOWER(?) ESCAPE '\\'
-        ''', (like_pattern,))
-        matching_ids.update(row[0] for row in cursor.fetchall())
-
-        # Search in codeBlockDiff entries (originalText, modifiedText, and diff content)
-        # Extract composer_id from key pattern: codeBlockDiff:{composer_id}:{diff_id}
-        cursor.execute('''
-            SELECT DISTINCT SUBSTR(key, 15, INSTR(SUBSTR(key, 15), ':') - 1) as composer_id
-            FROM cursorDiskKV
-            WHERE key LIKE 'codeBlockDiff:%'
-              AND (
-                LOWER(value ->> '$.originalText') LIKE LOWER(?) ESCAPE '\\'
-                OR LOWER(value ->> '$.modifiedText') LIKE LOWER(?) ESCAPE '\\'
-                OR LOWER(value) LIKE LOWER(?) ESCAPE '\\'
-              )
-        ''', (like_pattern, like_pattern, like_pattern))
-        matching_ids.update(row[0] for row in cursor.fetchall())
-
-        return matching_ids
-
-    def find_by_title(self, title_query: str, include_empty: bool = False) -> List[Dict[str, Any]]:
+        where_sql, params = self._conversation_filters(since, before, include_empty, archived=None)
+        if exact:
+            where_sql += " AND c.key = 'composerData:' || ?"
+        else:
+            where_sql += " AND INSTR(SUBSTR(c.key, 14), ?) > 0"
+        return self._fetch_conversations(where_sql, [*params, id_query], limit=limit)
+
+    def find_by_title(
+        self, title_query: str, since: Optional[TimeSpec] = None, before: Optional[TimeSpec] = None,
+        include_empty: bool = False, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """Find conversations by title or subtitle.
 
         Args:
-            title_query: Search string for title matching.
+            title_query: Search string for title matching (case-insensitive).
+            since: Filter conversations created since this time
+            before: Filter conversations created before this time
             include_empty: Include empty conversations. Default: False
+            limit: Maximum number of conversations to return. None for no limit.
 
         Returns:
-            List of conversations with matching titles.
+            List of conversations with matching titles, newest first.
         """
-        all_conversations = self.list_conversations(include_empty=include_empty)
-        query_lower = title_query.lower()
-
-        return [
-            conv
-            for conv in all_conversations
-            if query_lower in conv['title'].lower() or query_lower in conv['subtitle'].lower()
-        ]
+        where_sql, params = self._conversation_filters(since, before, include_empty, archived=None)
+        # Titles are matched with Python's Unicode-aware lower() (LIKE would only
+        # ignore the case of ASCII letters), so "über" still finds "Über"
+        title_lower = title_query.lower()
+        where_sql += '''
+            AND (
+                INSTR(unicode_lower(COALESCE(json_extract(c.value, '$.name'), '(no title)')), ?) > 0
+                OR INSTR(unicode_lower(COALESCE(json_extract(c.value, '$.subtitle'), '')), ?) > 0
+            )
+        '''
+        return self._fetch_conversations(where_sql, [*params, title_lower, title_lower], limit=limit)
 
     def get_code_block_diff(self, composer_id: str, diff_id: str) -> Optional[Dict[str, Any]]:
         """Get the code block diff data for a specific diff ID.
@@ -416,15 +763,41 @@ class CursorDatabase:
         Returns:
             Dictionary with diff data, or None if not found.
         """
-        conn = self._connect()
-        cursor = conn.cursor()
+        cursor = self._connect().cursor()
 
-        cursor.execute(f'SELECT value FROM cursorDiskKV WHERE key = "codeBlockDiff:{composer_id}:{diff_id}"')
+        cursor.execute(
+            "SELECT value FROM cursorDiskKV WHERE key = 'codeBlockDiff:' || ? || ':' || ?",
+            (composer_id, diff_id)
+        )
         row = cursor.fetchone()
 
-        conn.close()
-
         if not row:
             return None
 
         return json.loads(row[0])
+
+    def get_code_block_diffs(self, composer_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get all code block diffs for a conversation in one query.
+
+        Args:
+            composer_id: The conversation/composer ID.
+
+        Returns:
+            Dictionary mapping diff ID to diff data.
+        """
+        cursor = self._connect().cursor()
+
+        cursor.execute('''
+            SELECT key, value FROM cursorDiskKV
+            WHERE key >= 'codeBlockDiff:' || ? || ':' AND key < 'codeBlockDiff:' || ? || ';'
+        ''', (composer_id, composer_id))
+
+        # Key pattern: codeBlockDiff:{composer_id}:{diff_id}
+        prefix_len = len(f'codeBlockDiff:{composer_id}:')
+        diffs = {
+            key[prefix_len:]: json.loads(value)
+            for key, value in cursor.fetchall()
+            if value is not None
+        }
+
+        return diffs
@@ -2,7 +2,10 @@
 
 import re
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
+
+# A time bound: a relative/absolute expression string, or an already-parsed datetime
+TimeSpec = Union[str, datetime]
 
 
 def parse_relative_time(time_str: str) -> Optional[datetime]:
@@ -107,10 +110,49 @@ def parse_datetime(time_str: str) -> Optional[datetime]:
     return parse_absolute_datetime(time_str)
 
 
+def parse_time_range(
+    since: Optional[TimeSpec] = None,
+    before: Optional[TimeSpec] = None
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Parse 'since' and 'before' time expressions into datetimes.
+
+    Values that are already datetimes (e.g. parsed once by the CLI) are
+    returned unchanged.
+
+    Args:
+        since: Start of the range (inclusive), relative or absolute
+        before: End of the range (exclusive), relative or absolute
+
+    Returns:
+        Tuple of (since_dt, before_dt); either may be None if not given
+
+    Raises:
+        ValueError: If a time expression cannot be parsed
+    """
+    since_dt = None
+    before_dt = None
+
+    if isinstance(since, datetime):
+        since_dt = since
+    elif since:
+        since_dt = parse_datetime(since)
+        if not since_dt:
+            raise ValueError(f"Could not parse 'since' time: {since}")
+
+    if isinstance(before, datetime):
+        before_dt = before
+    elif before:
+        before_dt = parse_datetime(before)
+        if not before_dt:
+            raise ValueError(f"Could not parse 'before' time: {before}")
+
+    return since_dt, before_dt
+
+
 def filter_by_time_range(
     items: list,
-    since: Optional[str] = None,
-    before: Optional[str] = None,
+    since: Optional[TimeSpec] = None,
+    before: Optional[TimeSpec] = None,
     date_key: str = 'created'
 ) -> list:
     """Filter items by time range.
@@ -127,18 +169,7 @@ def filter_by_time_range(
     if not since and not before:
         return items
 
-    since_dt = None
-    before_dt = None
-
-    if since:
-        since_dt = parse_datetime(since)
-        if not since_dt:
-            raise ValueError(f"Could not parse 'since' time: {since}")
-
-    if before:
-        before_dt = parse_datetime(before)
-        if not before_dt:
-            raise ValueError(f"Could not parse 'before' time: {before}")
+    since_dt, before_dt = parse_time_range(since, before)
 
     filtered = []
     for item in items:
@@ -2,7 +2,7 @@
 
 import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 from rich.table import Table
 from rich.panel import Panel
@@ -10,7 +10,7 @@ from rich.markdown import Markdown
 from rich.padding import Padding
 from rich.console import Group
 
-from .utils import get_code_blocks_for_message, normalize_model_name, format_timestamp, truncate_text, get_model_style
+from .utils import index_code_blocks_by_message, normalize_model_name, format_timestamp, truncate_text, get_model_style
 
 
 class Formatter(ABC):
@@ -59,6 +59,7 @@ class MarkdownFormatter(Formatter):
         conversation: Dict[str, Any],
         messages: List[Dict[str, Any]],
         show_empty: bool = False,
+        head: Optional[int] = None,
         **options  # Ignore other options like show_code_diff
     ) -> str:
         """Format conversation as markdown document.
@@ -67,19 +68,43 @@ class MarkdownFormatter(Formatter):
             conversation: Conversation metadata
             messages: List of messages
             show_empty: Whether to include empty messages
+            head: Only include the first N displayed messages (None for all)
 
         Returns:
             Markdown formatted string
         """
-        lines = []
+        return "\n".join(self.iter_conversation_lines(
+            conversation, messages, show_empty=show_empty, head=head
+        ))
+
+    def iter_conversation_lines(
+        self,
+        conversation: Dict[str, Any],
+        messages: List[Dict[str, Any]],
+        show_empty: bool = False,
+        head: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Yield the markdown document for a conversation line by line.
+
+        Lets callers write large conversations incrementally instead of
+        building the whole document as one string first.
+
+        Args:
+            conversation: Conversation metadata
+            messages: List of messages
+            show_empty: Whether to include empty messages
+            head: Only include the first N displayed messages (None for all)
 
+        Yields:
+            Markdown lines (joined with newlines, they form format_conversation()'s output)
+        """
         # Header section
         title = conversation.get('name', '(no title)')
-        lines.append(f"# {title}\n")
+        yield f"# {title}\n"
 
         subtitle = conversation.get('subtitle', '')
         if subtitle:
-            lines.append(f"_{subtitle}_\n")
+            yield f"_{subtitle}_\n"
 
         # Metadata
         composer_id = conversation.get('composerId', 'unknown')
@@ -93,8 +118,8 @@ class MarkdownFormatter(Formatter):
         else:
             created_at = created_at_raw
 
-        # Extract code block data from conversation (needed for counting visible messages)
-        code_block_data = conversation.get('codeBlockData', {})
+        # Group the conversation's code blocks by message once (needed for counting visible messages)
+        code_blocks_by_message = index_code_blocks_by_message(conversation.get('codeBlockData', {}))
 
         # Count visible messages (non-empty text or has code blocks, or all if show_empty)
         if show_empty:
@@ -103,15 +128,15 @@ class MarkdownFormatter(Formatter):
             visible_count = 0
             for msg in messages:
                 has_content = (msg.get('text') or '').strip()
-                has_code_blocks = bool(get_code_blocks_for_message(msg['id'], code_block_data))
+                has_code_blocks = bool(code_blocks_by_message.get(msg['id']))
                 if has_content or has_code_blocks:
                     visible_count += 1
 
-        lines.append(f"**ID:** {composer_id}\n")
-        lines.append(f"**Created:** {created_at}\n")
-        lines.append(f"**Status:** {status}\n")
-        lines.append(f"**Messages:** {visible_count}\n")
-        lines.append("---\n")
+        yield f"**ID:** {composer_id}\n"
+        yield f"**Created:** {created_at}\n"
+        yield f"**Status:** {status}\n"
+        yield f"**Messages:** {visible_count}\n"
+        yield "---\n"
 
         # Pre-compute effective model for each message by propagating explicit selections
         # Before any explicit selection, we don't know the model so use None
@@ -124,16 +149,25 @@ class MarkdownFormatter(Formatter):
             effective_models.append(current_model)
 
         # Messages section
+        shown = 0
         for i, msg in enumerate(messages, 1):
             # Skip empty messages unless show_empty is True
             # A message is empty if it has no text AND no code blocks
             text = msg.get('text', '')
             has_content = text.strip() if text else False
-            code_blocks = get_code_blocks_for_message(msg['id'], code_block_data)
+            code_blocks = code_blocks_by_message.get(msg['id'], [])
             is_empty = not has_content and not code_blocks
             if is_empty and not show_empty:
                 continue
 
+            # Stop once --head messages have been output, without formatting the rest,
+            # and say so, so the excerpt isn't mistaken for the whole conversation
+            if head is not None and shown >= head:
+                remaining = visible_count - shown
+                yield f"*… {remaining} more message{'s' if remaining != 1 else ''} not shown (--head)*\n"
+                break
+            shown += 1
+
             # Determine speaker/type label
             if msg['type'] == 'user':
                 speaker = "USER"
@@ -145,22 +179,20 @@ class MarkdownFormatter(Formatter):
                     speaker = "ASSISTANT"  # Unknown model before first explicit selection
 
             created = msg.get('created', '')
-            lines.append(f"## {i}. {speaker} - {created}\n")
+            yield f"## {i}. {speaker} - {created}\n"
 
             # Message text
             text = msg.get('text', '')
             if text:
-                lines.append(f"{text}\n")
+                yield f"{text}\n"
             else:
-                lines.append("*(empty message)*\n")
+                yield "*(empty message)*\n"
 
             # Code blocks metadata
             if code_blocks:
-                lines.append(f"*Code blocks: {len(code_blocks)}*\n")
+                yield f"*Code blocks: {len(code_blocks)}*\n"
 
-            lines.append("")  # Extra newline between messages
-
-        return "\n".join(lines)
+            yield ""  # Extra newline between messages
 
     def format_conversation_list(
         self,
@@ -215,6 +247,7 @@ class RichFormatter(Formatter):
         show_empty: bool = False,
         show_thinking: bool = False,
         show_tool_calls: bool = False,
+        head: Optional[int] = None,
         db = None  # Database instance for fetching diff data
     ) -> Group:
         """Format conversation as Rich chat bubbles.
@@ -227,6 +260,7 @@ class RichFormatter(Formatter):
             show_empty: Whether to show empty messages
             show_thinking: Whether to expand thinking/reasoning traces
             show_tool_calls: Whether to expand tool call details
+            head: Only render the first N displayed messages (None for all)
             db: Database instance (needed for fetching diff data)
 
         Returns:
@@ -249,8 +283,11 @@ class RichFormatter(Formatter):
         else:
             created_at = created_at_raw
 
-        # Extract code block data from conversation (needed for counting visible messages)
-        code_block_data = conversation.get('codeBlockData', {})
+        # Group the conversation's code blocks by message once (needed for counting visible messages)
+        code_blocks_by_message = index_code_blocks_by_message(conversation.get('codeBlockData', {}))
+
+        # Fetch all of this conversation's diffs up front rather than one query per code block
+        code_block_diffs = db.get_code_block_diffs(composer_id) if show_code_diff and db else {}
 
         # Count visible messages (non-empty text, code blocks, thinking, or tool calls)
         if show_empty:
@@ -259,7 +296,7 @@ class RichFormatter(Formatter):
             visible_count = 0
             for msg in messages:
                 has_content = (msg.get('text') or '').strip()
-                has_code_blocks = bool(get_code_blocks_for_message(msg['id'], code_block_data))
+                has_code_blocks = bool(code_blocks_by_message.get(msg['id']))
                 has_thinking = bool(msg.get('thinking'))
                 has_tool_call = bool(msg.get('tool_call'))
                 if has_content or has_code_blocks or has_thinking or has_tool_call:
@@ -294,12 +331,13 @@ class RichFormatter(Formatter):
             effective_models.append(current_model)
 
         # Process messages
+        shown = 0
         for i, msg in enumerate(messages, 1):
             created = msg.get('created', '')
             timestamp = format_timestamp(created)
 
             # Check for code blocks associated with this message
-            code_blocks = get_code_blocks_for_message(msg['id'], code_block_data)
+            code_blocks = code_blocks_by_message.get(msg['id'], [])
 
             # Skip empty messages unless --show-empty is set
             # Consider messages with only whitespace as empty
@@ -311,6 +349,16 @@ class RichFormatter(Formatter):
             if is_empty and not show_empty:
                 continue
 
+            # Stop once --head messages have been rendered, without building panels for the rest,
+            # and say so, so the excerpt isn't mistaken for the whole conversation
+            if head is not None and shown >= head:
+                remaining = visible_count - shown
+                renderables.append(
+                    f"[dim]… {remaining} more message{'s' if remaining != 1 else ''} not shown (--head)[/dim]"
+                )
+                break
+            shown += 1
+
             # Determine speaker label and styling
             if msg['type'] == 'user':
                 speaker = "You"
@@ -446,7 +494,7 @@ class RichFormatter(Formatter):
                             code_block_info.append(f"  [dim]Created: {cb['created_at']}[/dim]")
 
                     if show_code_diff and cb['diff_id'] and db:
-                        diff_data = db.get_code_block_diff(composer_id, cb['diff_id'])
+                        diff_data = code_block_diffs.get(cb['diff_id'])
                         if diff_data:
                             code_block_info.append(f"\n[yellow]Diff for {cb['file']}:[/yellow]")
                             # Display the diff content from newModelDiffWrtV0
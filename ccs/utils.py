@@ -1,5 +1,6 @@
 """Utility functions for CCS CLI."""
 
+import functools
 from pathlib import Path
 from typing import Dict, Any, List
 
@@ -7,6 +8,9 @@ from typing import Dict, Any, List
 def get_code_blocks_for_message(bubble_id: str, code_block_data: dict) -> List[Dict[str, Any]]:
     """Extract code blocks associated with a specific message bubble.
 
+    When looking up blocks for many messages of the same conversation, build
+    the mapping once with index_code_blocks_by_message() instead.
+
     Args:
         bubble_id: The message bubble ID
         code_block_data: The codeBlockData from the conversation
@@ -14,32 +18,47 @@ def get_code_blocks_for_message(bubble_id: str, code_block_data: dict) -> List[D
     Returns:
         List of code block info dictionaries with keys: file, full_path, language, status, diff_id, created_at
     """
-    code_blocks = []
+    return index_code_blocks_by_message(code_block_data).get(bubble_id, [])
+
+
+def index_code_blocks_by_message(code_block_data: dict) -> Dict[str, List[Dict[str, Any]]]:
+    """Group a conversation's code blocks by the message bubble they belong to.
+
+    Args:
+        code_block_data: The codeBlockData from the conversation
+
+    Returns:
+        Dict mapping bubble ID to its list of code block info dictionaries (same
+        shape as get_code_blocks_for_message() returns)
+    """
+    code_blocks_by_message: Dict[str, List[Dict[str, Any]]] = {}
 
     # codeBlockData structure: {file_uri: {codeblock_id: {...data, bubbleId: ...}}}
     for file_uri, blocks in code_block_data.items():
-        for block_id, block_data in blocks.items():
-            if block_data.get('bubbleId') == bubble_id:
-                # Extract file path from URI
-                file_path = file_uri.replace('file://', '')
-                # Get just the filename
-                filename = Path(file_path).name
+        # Extract file path from URI
+        file_path = file_uri.replace('file://', '')
+        # Get just the filename
+        filename = Path(file_path).name
 
-                code_blocks.append({
-                    'file': filename,
-                    'full_path': file_path,
-                    'language': block_data.get('languageId', 'unknown'),
-                    'status': block_data.get('status', 'unknown'),
-                    'diff_id': block_data.get('diffId', ''),
-                    'created_at': block_data.get('createdAt', ''),
-                })
+        for block_id, block_data in blocks.items():
+            code_blocks_by_message.setdefault(block_data.get('bubbleId'), []).append({
+                'file': filename,
+                'full_path': file_path,
+                'language': block_data.get('languageId', 'unknown'),
+                'status': block_data.get('status', 'unknown'),
+                'diff_id': block_data.get('diffId', ''),
+                'created_at': block_data.get('createdAt', ''),
+            })
 
-    return code_blocks
+    return code_blocks_by_message
 
 
+@functools.cache
 def normalize_model_name(model_name: str) -> str:
     """Normalize model names for display.
 
+    Cached, since a conversation repeats the same few model names on every message.
+
     Examples:
         "claude-3-5-sonnet" -> "Claude 3 5 Sonnet"
         "gpt-4" -> "GPT-4"
@@ -51,12 +70,14 @@ def normalize_model_name(model_name: str) -> str:
     Returns:
         Formatted model name for display
     """
-    if 'claude' in model_name.lower():
+    name_lower = model_name.lower()
+
+    if 'claude' in name_lower:
         # Clean up Claude model names: "claude-3-5-sonnet" -> "Claude 3 5 Sonnet"
         return model_name.replace('claude-', 'Claude ').replace('-', ' ').title()
-    elif 'gpt' in model_name.lower():
+    elif 'gpt' in name_lower:
         # Keep GPT names uppercase
-        return model_name.upper().replace('-', '-')
+        return model_name.upper()
     else:
         # Default: title case
         return model_name.title()
@@ -88,9 +109,12 @@ def format_timestamp(created: str) -> str:
         return created[:10] if len(created) >= 10 else created
 
 
+@functools.cache
 def get_model_style(model_name: str | None) -> dict:
     """Get styling information for a model based on its family/provider.
 
+    Cached per model name; the returned dict is shared, so don't modify it.
+
     Args:
         model_name: Model name (can be None for unknown models)
 